@@ -57,8 +57,9 @@ class StepStatesWalkers(StatesWalkers):
          ``init_action`` and ``init_dts``.
         """
         clone, compas = super(StepStatesWalkers, self).clone(**kwargs)
-        self.init_actions[clone] = copy.deepcopy(self.init_actions[compas][clone])
-        self.init_dts[clone] = copy.deepcopy(self.init_dts[compas][clone])
+        compas_sel = compas[clone]
+        self.init_actions[clone] = self.init_actions[compas_sel]
+        self.init_dts[clone] = self.init_dts[compas_sel]
         return clone, compas
 
     def reset(self):
@@ -220,12 +221,8 @@ class MajorityDiscreteModel(RootModel):
             will use to step the :env:`Environment`.
 
         """
-        init_actions = judo.astype(walkers.states.init_actions.flatten(), judo.int)
-        init_actions = judo.to_numpy(init_actions)
-        with Backend.use_backend("numpy"):
-            y = numpy.bincount(init_actions)
-            most_used_action = numpy.nonzero(y)[0][0]
-        most_used_action = tensor(most_used_action)
+        init_actions = judo.to_numpy(walkers.states.init_actions).flatten().astype(numpy.int64)
+        most_used_action = tensor(numpy.argmax(numpy.bincount(init_actions)))
         root_model_states = StatesModel(
             batch_size=1,
             state_dict={"actions": {"dtype": judo.int64}, "dt": {"dtype": judo.int64}},
@@ -43,8 +43,14 @@ class StatesOwner:
 
     def create_new_states(self, batch_size: int) -> "StatesOwner.STATE_CLASS":
         """Create new states of given batch_size to store the data of the class."""
-        param_dict = self.get_params_dict()
-        return self.STATE_CLASS(state_dict=param_dict, batch_size=batch_size)
+        param_dict = getattr(self, "_param_dict_cache", None)
+        if param_dict is None:
+            param_dict = self.get_params_dict()
+            self._param_dict_cache = param_dict
+        # The States constructor mutates the dict it receives when resolving
+        # the sizes, so hand it a per-call copy to keep the cache intact.
+        state_dict = {name: dict(spec) for name, spec in param_dict.items()}
+        return self.STATE_CLASS(state_dict=state_dict, batch_size=batch_size)
 
     def states_from_data(self, batch_size: int, **kwargs) -> States:
         """
@@ -2,6 +2,7 @@ from typing import Dict, Union
 
 import judo
 from judo import Backend, tensor
+import numpy
 
 from fragile.core.base_classes import BaseEnvironment
 from fragile.core.states import StatesEnv, StatesModel
@@ -71,17 +72,13 @@ class Environment(BaseEnvironment):
         by the environment."""
         oobs = tensor(oobs, dtype=judo.bool)
         terminals = (
-            tensor(oobs, dtype=judo.bool)
+            tensor(terminals, dtype=judo.bool)
             if terminals is not None
-            else judo.zeros(len(oobs), dtype=judo.bool)
+            else judo.zeros_like(oobs)
         )
         rewards = tensor(rewards, dtype=judo.float32)
         observs = tensor(observs)
-        try:
-            states = tensor(states)
-        except Exception as e:
-            print(Backend.get_current_backend())
-            raise e
+        states = tensor(states)
         state = super(Environment, self).states_from_data(
             batch_size=batch_size,
             states=states,
@@ -172,7 +169,9 @@ class DiscreteEnv(Environment):
         new_states, observs, rewards, ends, infos = self._env.step_batch(
             actions=judo.to_numpy(actions), states=judo.to_numpy(states), dt=dt
         )
-        game_ends = [inf.get("win", False) for inf in infos]
+        game_ends = numpy.fromiter(
+            (inf.get("win", False) for inf in infos), dtype=numpy.bool_, count=len(infos)
+        )
         data = {
             "states": tensor(new_states),
             "observs": tensor(observs),
@@ -199,12 +198,12 @@ class DiscreteEnv(Environment):
         """
         with Backend.use_backend("numpy"):
             state, obs = self._env.reset()
-            states = tensor([state.copy() for _ in range(batch_size)]).copy()
-            observs = tensor([obs.copy() for _ in range(batch_size)]).copy().astype(judo.float32)
-        # observs = tensor(observs)
-        # states = tensor(states)
+            states = judo.zeros((batch_size,) + state.shape, dtype=state.dtype)
+            states[:] = state
+            observs = judo.zeros((batch_size,) + obs.shape, dtype=judo.float32)
+            observs[:] = obs
         rewards = judo.zeros(batch_size, dtype=judo.float32)
-        times = judo.zeros_like(rewards)
+        times = judo.zeros(batch_size, dtype=judo.float32)
         oobs = judo.zeros(batch_size, dtype=judo.bool)
         new_states = self.states_from_data(
             batch_size=batch_size,
@@ -0,0 +1,96 @@
+"""Numba-compiled kernels for the hot numeric loops of the :class:`Walkers` balance step."""
+import math
+
+from numba import jit
+import numpy
+
+
+@jit(nopython=True)
+def relativize_kernel(x: numpy.ndarray) -> numpy.ndarray:
+    """Apply the relativize transform writing the result in a single array pass."""
+    mean = x.mean()
+    std = x.std()
+    out = numpy.empty_like(x)
+    if std == 0.0:
+        out[:] = 1.0
+        return out
+    for i in range(x.size):
+        standard = (x[i] - mean) / std
+        if standard > 0.0:
+            out[i] = math.log1p(standard) + 1.0
+        else:
+            out[i] = math.exp(standard)
+    return out
+
+
+@jit(nopython=True)
+def all_equal_kernel(x: numpy.ndarray) -> bool:
+    """Return ``True`` when every value equals the first one, bailing out early."""
+    first = x[0]
+    for i in range(1, x.size):
+        if x[i] != first:
+            return False
+    return True
+
+
+@jit(nopython=True)
+def clone_probs_kernel(
+    virtual_rewards: numpy.ndarray, compas_ix: numpy.ndarray, out: numpy.ndarray,
+) -> numpy.ndarray:
+    """Compute the clone probability of every walker in a single fused loop.
+
+    Walkers with a zero virtual reward clone with probability one towards a \
+    scored companion instead of propagating the inf/nan a plain division \
+    would produce.
+    """
+    for i in range(virtual_rewards.size):
+        vr = virtual_rewards[i]
+        if vr != 0.0:
+            out[i] = (virtual_rewards[compas_ix[i]] - vr) / vr
+        else:
+            out[i] = 1.0 if virtual_rewards[compas_ix[i]] > 0.0 else 0.0
+    return out
+
+
+@jit(nopython=True)
+def virtual_reward_kernel(
+    rewards: numpy.ndarray, distances: numpy.ndarray, reward_scale: float, distance_scale: float,
+):
+    """Fuse the relativized rewards and the virtual reward product into one loop."""
+    processed = relativize_kernel(rewards)
+    virt = numpy.empty_like(processed)
+    for i in range(processed.size):
+        virt[i] = processed[i] ** reward_scale * distances[i] ** distance_scale
+    return virt, processed
+
+
+@jit(nopython=True)
+def virtual_reward_entropy_kernel(
+    rewards: numpy.ndarray, distances: numpy.ndarray, reward_scale: float, distance_scale: float,
+):
+    """Compute the virtual reward together with the swarm entropy statistics.
+
+    The entropy products are accumulated in log space to avoid the underflow \
+    that a plain product over many walkers can hit.
+    """
+    processed = relativize_kernel(rewards)
+    n = processed.size
+    score_reward = numpy.empty_like(processed)
+    score_dist = numpy.empty_like(processed)
+    sum_reward = 0.0
+    sum_dist = 0.0
+    for i in range(n):
+        score_reward[i] = processed[i] ** reward_scale
+        score_dist[i] = distances[i] ** distance_scale
+        sum_reward += score_reward[i]
+        sum_dist += score_dist[i]
+    virt = numpy.empty_like(processed)
+    log_total = 0.0
+    log_min = 0.0
+    for i in range(n):
+        virt[i] = score_reward[i] * score_dist[i]
+        reward_prob = score_reward[i] / sum_reward
+        dist_prob = score_dist[i] / sum_dist
+        log_total += math.log(2.0 - dist_prob ** reward_prob)
+        log_min += math.log(2.0 - reward_prob ** reward_prob)
+    return virt, processed, math.exp(log_total), math.exp(log_min)
@@ -2,13 +2,18 @@ from typing import Optional, Union
 
 import judo
 from judo import Backend, Bounds, tensor
-from numba import jit
+import numpy
 
 from fragile.core.base_classes import BaseCritic, BaseModel
 from fragile.core.env import DiscreteEnv
 from fragile.core.states import StatesEnv, StatesModel, StatesWalkers
 from fragile.core.typing import StateDict, Tensor
 
+# Parameter templates shared by every model instance. ``get_params_dict``
+# hands out per-entry copies so callers can mutate the result freely.
+_DT_MODEL_PARAMS = {"dt": {"dtype": judo.float32}, "critic_score": {"dtype": judo.int64}}
+_DISCRETE_ACTIONS_PARAMS = {"actions": {"dtype": judo.int64}}
+
 
 class Model(BaseModel):
     """
@@ -30,6 +35,17 @@ class Model(BaseModel):
         """
         self.critic: BaseCritic = critic
 
+    @property
+    def critic(self) -> Optional[BaseCritic]:
+        """Return the :class:`Critic` that computes the extra values of the model."""
+        return self._critic
+
+    @critic.setter
+    def critic(self, critic: Optional[BaseCritic]):
+        self._critic = critic
+        # The cached params dict merges the critic params, so rebuild it lazily.
+        self._param_dict_cache = None
+
     def sample(
         self,
         batch_size: int,
@@ -171,6 +187,17 @@ class _DtModel(Model):
     This model is not meant to be instantiated directly but used for class inheritance.
     """
 
+    def __init__(self, critic: Optional[BaseCritic] = None, env=None):
+        """Initialize a :class:`_DtModel`.
+
+        Args:
+            critic: :class:`Critic` used to calculate an additional value.
+            env: Ignored. Used to match callable initialization inside a swarm.
+
+        """
+        super(_DtModel, self).__init__(critic=critic, env=env)
+        self._dt_ones = None
+
     def get_params_dict(self, override_params: bool = True) -> StateDict:
         """
         Return the dictionary with the parameters to create a new `DiscreteUniform` model.
@@ -183,7 +210,7 @@ class _DtModel(Model):
             dict containing the parameters of both the :class:`Model` and its :class:`Critic`.
 
         """
-        dt = {"dt": {"dtype": judo.float32}, "critic_score": {"dtype": judo.int64}}
+        dt = {name: dict(spec) for name, spec in _DT_MODEL_PARAMS.items()}
         all_params = self.add_critic_params(params=dt, override_params=override_params)
         return all_params
 
@@ -217,14 +244,18 @@ class _DtModel(Model):
                 batch_size=batch_size, model_states=model_states, **critic_kwargs
             )
 
-            dt = (
-                critic_states.critic_score
-                if judo.is_tensor(critic_states.critic_score)
-                else critic_states.critic_score
-            )
+            dt = critic_states.critic_score
             model_states.update(actions=actions, other=critic_states, dt=dt)
         else:
-            dt = judo.ones(batch_size, dtype=judo.int64)
+            # Keep a cached all-ones buffer so each step only pays for a copy
+            # instead of an allocation plus a fill. A copy is handed out
+            # because update rebinds attributes: sharing the buffer itself
+            # would let in-place writes to dt corrupt every later epoch.
+            ones = self._dt_ones
+            if ones is None or len(ones) < batch_size:
+                ones = judo.ones(batch_size, dtype=judo.int64)
+                self._dt_ones = ones
+            dt = judo.copy(ones[:batch_size])
             model_states.update(actions=actions, critic_score=dt, dt=dt, **kwargs)
         return model_states
 
@@ -233,7 +264,11 @@ class DiscreteModel(_DtModel):
     """It represents the base Model class that handles a discrete set of possible outcomes."""
 
     def __init__(
-        self, n_actions: int = None, critic: BaseCritic = None, env: DiscreteEnv = None,
+        self,
+        n_actions: int = None,
+        critic: BaseCritic = None,
+        env: DiscreteEnv = None,
+        actions_dtype=None,
     ):
         """
         Initialize a :class:`DiscreteModel`.
@@ -243,12 +278,16 @@ class DiscreteModel(_DtModel):
             env: :class:`DiscreteEnvironment` that will be used to extract the \
             number of different possible outcomes.
             critic: Critic used to calculate the time step strategy.
+            actions_dtype: Dtype used to store the sampled actions. Defaults to \
+            ``judo.int64``. A narrower integer dtype can be provided to reduce \
+            the memory used by the actions when ``n_actions`` is small.
 
         """
         super(DiscreteModel, self).__init__(critic=critic)
         if n_actions is None and env is None:
             raise ValueError("Env and n_actions cannot be both None.")
         self._n_actions = env.n_actions if n_actions is None else n_actions
+        self._actions_dtype = actions_dtype
 
     @property
     def n_actions(self) -> int:
@@ -258,7 +297,9 @@ class DiscreteModel(_DtModel):
     def get_params_dict(self, override_params: bool = True) -> StateDict:
         """Return the dictionary with the parameters to create a new `DiscreteUniform` model."""
         params = super(DiscreteModel, self).get_params_dict(override_params=override_params)
-        params.update({"actions": {"dtype": judo.int64}})
+        params.update({name: dict(spec) for name, spec in _DISCRETE_ACTIONS_PARAMS.items()})
+        if self._actions_dtype is not None:
+            params["actions"]["dtype"] = self._actions_dtype
         return params
 
 
@@ -283,6 +324,8 @@ class DiscreteUniform(DiscreteModel):
 
         """
         actions = self.random_state.randint(0, self.n_actions, size=batch_size)
+        if self._actions_dtype is not None:
+            actions = judo.astype(actions, self._actions_dtype)
         return self.update_states_with_critic(
             actions=actions, model_states=model_states, batch_size=batch_size, **kwargs
         )
@@ -300,6 +343,8 @@ class BinarySwap(DiscreteModel):
         n_actions: int = None,
         critic: BaseCritic = None,
         env: DiscreteEnv = None,
+        distinct_swaps: bool = False,
+        actions_dtype=None,
     ):
         """
         Initialize a :class:`BinarySwap`.
@@ -312,17 +357,31 @@ class BinarySwap(DiscreteModel):
             env: :class:`DiscreteEnvironment` that will be used to extract the \
             dimension of the target vector.
             critic: dt_sampler used to calculate an additional time step strategy.
+            distinct_swaps: If ``True`` the swapped dimensions of each walker \
+                            are sampled without replacement, so every call \
+                            flips exactly ``n_swaps`` values. By default \
+                            repeated dimensions are allowed and cancel out.
+            actions_dtype: Dtype used to store the sampled actions. Defaults to \
+            ``judo.int64``. A narrower integer dtype can be provided to reduce \
+            the memory used by the binary action matrix.
 
         """
-        super(BinarySwap, self).__init__(critic=critic, n_actions=n_actions, env=env)
+        super(BinarySwap, self).__init__(
+            critic=critic, n_actions=n_actions, env=env, actions_dtype=actions_dtype
+        )
         if n_swaps <= 0:
             raise ValueError("n_swaps must be greater than 0.")
         self.n_swaps = n_swaps if n_swaps is not None else self.n_actions
+        if distinct_swaps and self.n_swaps > self.n_actions:
+            raise ValueError("n_swaps cannot be greater than n_actions when distinct_swaps.")
+        self.distinct_swaps = distinct_swaps
+        self._actions_buf = None
 
     def get_params_dict(self, override_params: bool = True) -> StateDict:
         """Return the dictionary with the parameters to create a new :class:`BinarySwap` model."""
         all_params = super(BinarySwap, self).get_params_dict(override_params=override_params)
-        actions = {"actions": {"dtype": judo.int64, "size": (self.n_actions,)}}
+        actions_dtype = judo.int64 if self._actions_dtype is None else self._actions_dtype
+        actions = {"actions": {"dtype": actions_dtype, "size": (self.n_actions,)}}
         all_params.update(actions)
         return all_params
 
@@ -347,30 +406,44 @@ class BinarySwap(DiscreteModel):
             :class:`States` variable containing the calculated actions and dt.
 
         """
-        import numpy
-
-        @jit(nopython=True)
-        def flip_values(actions: numpy.ndarray, flips: numpy.ndarray):
-            for i in range(flips.shape[0]):
-                for j in range(flips.shape[1]):
-                    actions[i, flips[i, j]] = numpy.logical_not(actions[i, flips[i, j]])
-            return actions
-
-        with Backend.use_backend("numpy"):
-            actions = (
-                judo.to_numpy(env_states.observs).copy()
-                if env_states is not None
-                else judo.zeros((batch_size, self.n_actions))
-            )
-            actions = judo.astype(actions, judo.bool)
-
-            flips = self.random_state.randint(0, self.n_actions, size=(batch_size, self.n_swaps))
-            actions = judo.astype(flip_values(actions, flips), judo.int64)
+        if Backend.is_numpy():
+            actions = self._swap_actions(batch_size=batch_size, env_states=env_states)
+        else:
+            with Backend.use_backend("numpy"):
+                actions = self._swap_actions(batch_size=batch_size, env_states=env_states)
         actions = tensor(actions)
         return self.update_states_with_critic(
             actions=actions, batch_size=batch_size, model_states=model_states, **kwargs
         )
 
+    def _swap_actions(self, batch_size: int, env_states: StatesEnv = None) -> numpy.ndarray:
+        """Return the int64 action matrix with ``n_swaps`` random flips per walker."""
+        actions = self._actions_buf
+        if actions is None or actions.shape[0] != batch_size:
+            actions = numpy.empty((batch_size, self.n_actions), dtype=numpy.bool_)
+            self._actions_buf = actions
+        if env_states is not None:
+            numpy.copyto(actions, judo.to_numpy(env_states.observs), casting="unsafe")
+        else:
+            actions.fill(False)
+
+        if self.distinct_swaps:
+            # The indexes of the n_swaps smallest entries of a random matrix
+            # are a uniform sample of distinct positions per row.
+            keys = self.random_state.random_sample((batch_size, self.n_actions))
+            flips = numpy.argpartition(keys, self.n_swaps - 1, axis=1)[:, : self.n_swaps]
+        else:
+            flips = self.random_state.randint(0, self.n_actions, size=(batch_size, self.n_swaps))
+        # Repeated indexes inside a row toggle the same value several times,
+        # so flip each entry according to the parity of its index count.
+        offsets = numpy.arange(batch_size) * self.n_actions
+        counts = numpy.bincount(
+            (flips + offsets[:, None]).ravel(), minlength=batch_size * self.n_actions,
+        )
+        actions ^= (counts & 1).astype(numpy.bool_).reshape(batch_size, self.n_actions)
+        actions_dtype = judo.int64 if self._actions_dtype is None else self._actions_dtype
+        return judo.astype(actions, actions_dtype)
+
 
 class ContinuousModel(_DtModel):
     """
@@ -398,6 +471,9 @@ class ContinuousModel(_DtModel):
             raise ValueError("bounds is None and env.bounds is not available.")
         super(ContinuousModel, self).__init__(critic=critic)
         self.bounds = bounds
+        # Plain ndarray copies of the bounds reused by the numpy sampling paths.
+        self._low = judo.to_numpy(self.bounds.low)
+        self._high = judo.to_numpy(self.bounds.high)
 
     @property
     def shape(self) -> tuple:
@@ -435,7 +511,7 @@ class ContinuousUniform(ContinuousModel):
 
         """
         actions = self.random_state.uniform(
-            low=self.bounds.low, high=self.bounds.high, size=tuple([batch_size]) + self.shape
+            low=self._low, high=self._high, size=tuple([batch_size]) + self.shape
         )
         actions = judo.astype(actions, self.bounds.dtype)
         return self.update_states_with_critic(
@@ -497,7 +573,11 @@ class NormalContinuous(ContinuousModel):
         actions = self.random_state.normal(
             size=tuple([batch_size]) + self.shape, loc=self.loc, scale=self.scale
         )
-        actions = self.bounds.clip(actions)
+        if isinstance(actions, numpy.ndarray):
+            # Clip the freshly drawn samples in place to avoid a temporary copy.
+            numpy.clip(actions, self._low, self._high, out=actions)
+        else:
+            actions = self.bounds.clip(actions)
         return self.update_states_with_critic(
             actions=actions, batch_size=batch_size, model_states=model_states, **kwargs
         )
@@ -43,7 +43,11 @@ class States(JudoStates):
     """
 
     def clone(
-        self, will_clone: Tensor, compas_ix: Tensor, ignore: Optional[Set[str]] = None,
+        self,
+        will_clone: Tensor,
+        compas_ix: Tensor,
+        ignore: Optional[Set[str]] = None,
+        compas_clone: Optional[Tensor] = None,
     ):
         """
         Clone all the stored data according to the provided arrays.
@@ -55,12 +59,17 @@ class States(JudoStates):
                        indexes of the walkers that will be copied.
             ignore: set containing the names of the attributes that will not be \
                     cloned.
+            compas_clone: Companion indexes of the walkers that will clone, \
+                          equal to ``compas_ix[will_clone]``. Pass it to share \
+                          the gather across several :class:`States`.
 
         """
         ignore = set() if ignore is None else ignore
+        if compas_clone is None:
+            compas_clone = compas_ix[will_clone]
         for name in self.keys():
             if judo.is_tensor(self[name]) and name not in ignore:
-                self[name][will_clone] = self[name][compas_ix][will_clone]
+                self[name][will_clone] = self[name][compas_clone]
 
 
 class StatesEnv(States):
@@ -236,11 +245,11 @@ class StatesWalkers(States):
         params = {
             "id_walkers": {"dtype": judo.hash_type},
             "compas_clone": {"dtype": judo.int64},
-            "processed_rewards": {"dtype": judo.float},
-            "virtual_rewards": {"dtype": judo.float},
+            "processed_rewards": {"dtype": judo.float32},
+            "virtual_rewards": {"dtype": judo.float32},
             "cum_rewards": {"dtype": judo.float},
-            "distances": {"dtype": judo.float},
-            "clone_probs": {"dtype": judo.float},
+            "distances": {"dtype": judo.float32},
+            "clone_probs": {"dtype": judo.float32},
             "will_clone": {"dtype": judo.bool},
             "in_bounds": {"dtype": judo.bool},
         }
@@ -251,28 +260,53 @@ class StatesWalkers(States):
     def clone(self, **kwargs) -> Tuple[Tensor, Tensor]:
         """Perform the clone only on cum_rewards and id_walkers and reset the other arrays."""
         clone, compas = self.will_clone, self.compas_clone
-        self.cum_rewards[clone] = self.cum_rewards[compas][clone]
-        self.id_walkers[clone] = self.id_walkers[compas][clone]
-        self.virtual_rewards[clone] = self.virtual_rewards[compas][clone]
+        compas_sel = compas[clone]
+        self.cum_rewards[clone] = self.cum_rewards[compas_sel]
+        self.id_walkers[clone] = self.id_walkers[compas_sel]
+        self.virtual_rewards[clone] = self.virtual_rewards[compas_sel]
         return clone, compas
 
+    def _reset_buffer(self, name: str, dtype, value) -> Tensor:
+        """Return the stored buffer refilled in place with ``value`` when its \
+        layout still matches, or a freshly allocated array otherwise."""
+        current = getattr(self, name, None)
+        if (
+            isinstance(current, numpy.ndarray)
+            and current.shape == (self.n,)
+            and current.dtype == dtype
+        ):
+            current.fill(value)
+            return current
+        buffer = judo.zeros(self.n, dtype=dtype)
+        if value:
+            buffer[:] = value
+        return buffer
+
+    def _reset_index(self, name: str) -> Tensor:
+        """Return the stored index buffer rewritten as an arange, or a new one."""
+        current = getattr(self, name, None)
+        if isinstance(current, numpy.ndarray) and current.shape == (self.n,):
+            current[:] = numpy.arange(self.n)
+            return current
+        return judo.arange(self.n)
+
     def reset(self):
-        """Clear the internal data of the class."""
+        """Clear the internal data of the class reusing the allocated buffers."""
         params = self.get_params_dict()
-        other_attrs = [name for name in self.keys() if name not in params]
+        other_attrs = [name for name in self.keys() if name not in params and name != "compas_dist"]
         for attr in other_attrs:
             setattr(self, attr, None)
         self.update(
-            id_walkers=judo.zeros(self.n, dtype=judo.hash_type),
-            compas_dist=judo.arange(self.n),
-            compas_clone=judo.arange(self.n),
-            processed_rewards=judo.zeros(self.n, dtype=judo.float),
-            cum_rewards=judo.zeros(self.n, dtype=judo.float),
-            virtual_rewards=judo.ones(self.n, dtype=judo.float),
-            distances=judo.zeros(self.n, dtype=judo.float),
-            clone_probs=judo.zeros(self.n, dtype=judo.float),
-            will_clone=judo.zeros(self.n, dtype=judo.bool),
-            in_bounds=judo.ones(self.n, dtype=judo.bool),
+            id_walkers=self._reset_buffer("id_walkers", judo.hash_type, 0),
+            compas_dist=self._reset_index("compas_dist"),
+            compas_clone=self._reset_index("compas_clone"),
+            processed_rewards=self._reset_buffer("processed_rewards", judo.float32, 0),
+            cum_rewards=self._reset_buffer("cum_rewards", judo.float, 0),
+            virtual_rewards=self._reset_buffer("virtual_rewards", judo.float32, 1),
+            distances=self._reset_buffer("distances", judo.float32, 0),
+            clone_probs=self._reset_buffer("clone_probs", judo.float32, 0),
+            will_clone=self._reset_buffer("will_clone", judo.bool, False),
+            in_bounds=self._reset_buffer("in_bounds", judo.bool, True),
         )
 
     def _ix(self, index: int):
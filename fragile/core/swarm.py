@@ -17,6 +17,9 @@ from fragile.core.typing import Scalar, Tensor
 from fragile.core.walkers import Walkers
 
 
+_MISSING = object()
+
+
 class Swarm(BaseSwarm):
     """
     The Swarm is in charge of performing a fractal evolution process.
@@ -152,16 +155,11 @@ class Swarm(BaseSwarm):
 
     def get(self, name: str, default: Any = None) -> Any:
         """Access attributes of the :class:`Swarm` and its children."""
-        if hasattr(self.walkers.states, name):
-            return getattr(self.walkers.states, name)
-        elif hasattr(self.walkers.env_states, name):
-            return getattr(self.walkers.env_states, name)
-        elif hasattr(self.walkers.model_states, name):
-            return getattr(self.walkers.model_states, name)
-        elif hasattr(self.walkers, name):
-            return getattr(self.walkers, name)
-        elif hasattr(self, name):
-            return getattr(self, name)
+        walkers = self.walkers
+        for owner in (walkers.states, walkers.env_states, walkers.model_states, walkers, self):
+            value = getattr(owner, name, _MISSING)
+            if value is not _MISSING:
+                return value
         return default
 
     def init_swarm(
@@ -319,13 +317,15 @@ class Swarm(BaseSwarm):
             walkers_states=walkers_states,
         )
 
+        next_report = report_interval
         for _ in self.get_run_loop(show_pbar=show_pbar):
             if self.calculate_end_condition():
                 break
             try:
                 self.run_step()
-                if self.epoch % report_interval == 0 and self.epoch > 0:
+                if self.epoch == next_report:
                     self.report_progress()
+                    next_report += report_interval
                 self.increment_epoch()
             except (KeyboardInterrupt, Exception) as e:
                 if not isinstance(e, KeyboardInterrupt):
@@ -357,14 +357,15 @@ class Swarm(BaseSwarm):
         no_tqdm = not (
             show_pbar if self._ipython_mode else self._log.level < logging.WARNING and show_pbar
         )
-        if self._ipython_mode:
-            from tqdm.notebook import trange
+        if no_tqdm:
+            loop_iterable = range(self.max_epochs)
         else:
-            from tqdm import trange
+            if self._ipython_mode:
+                from tqdm.notebook import trange
+            else:
+                from tqdm import trange
 
-        loop_iterable = trange(
-            self.max_epochs, desc="%s" % self.__class__.__name__, disable=no_tqdm
-        )
+            loop_iterable = trange(self.max_epochs, desc="%s" % self.__class__.__name__)
 
         if self._ipython_mode and self._use_notebook_widget:
             from IPython.core.display import display
@@ -477,7 +478,7 @@ class Swarm(BaseSwarm):
     def _update_env_with_root(self, root_walker, env_states) -> StatesEnv:
         env_states.rewards[:] = root_walker.rewards
         env_states.states[:] = root_walker.states
-        env_states.observs = judo.tile(root_walker.observs, (len(env_states), 1))
+        env_states.observs[:] = root_walker.observs
         return env_states
 
 
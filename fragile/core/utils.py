@@ -1,4 +1,5 @@
 import judo
+from numba import jit
 import numpy
 
 
@@ -34,14 +35,29 @@ def get_plangym_env(swarm: "Swarm") -> "plangym.BaseEnvironment":  # noqa: F821
         return plangym_env
 
 
+@jit(nopython=True)
+def _array_statistics(x: numpy.ndarray):
+    """Accumulate the (mean, std, max, min) of a flat float array in a single pass."""
+    mean, m2 = 0.0, 0.0
+    max_, min_ = x[0], x[0]
+    for i in range(x.size):
+        val = x[i]
+        delta = val - mean
+        mean += delta / (i + 1)
+        m2 += delta * (val - mean)
+        if val > max_:
+            max_ = val
+        if val < min_:
+            min_ = val
+    return mean, numpy.sqrt(m2 / x.size), max_, min_
+
+
 def statistics_from_array(x: numpy.ndarray):
     """Return the (mean, std, max, min) of an array."""
     try:
-        return (
-            judo.to_numpy(x).mean(),
-            judo.to_numpy(x).std(),
-            judo.to_numpy(x).max(),
-            judo.to_numpy(x).min(),
-        )
+        x = judo.to_numpy(x).astype(numpy.float64).ravel()
     except AttributeError:
         return numpy.nan, numpy.nan, numpy.nan, numpy.nan
+    if x.size == 0:
+        return numpy.nan, numpy.nan, numpy.nan, numpy.nan
+    return _array_statistics(x)
@@ -1,16 +1,28 @@
 from typing import Any, Callable, Dict, Optional, Set
 
 import judo
-from judo import dtype, hasher, tensor
+from judo import Backend, dtype, hasher, tensor
 from judo.functions.fractalai import relativize
 import numpy
 
 from fragile.core.base_classes import BaseCritic, BaseWalkers
+from fragile.core.kernels import (
+    all_equal_kernel,
+    clone_probs_kernel,
+    relativize_kernel,
+    virtual_reward_entropy_kernel,
+    virtual_reward_kernel,
+)
 from fragile.core.states import StatesEnv, StatesModel, StatesWalkers
 from fragile.core.typing import DistanceFunction, Scalar, StateDict, Tensor, Tuple
 from fragile.core.utils import statistics_from_array
 
 
+_MISSING = object()
+# Column block used to tile the distance reductions over very wide observations.
+_DIST_BLOCK_COLS = 4096
+
+
 class SimpleWalkers(BaseWalkers):
     """
     This class is in charge of performing all the mathematical operations involved in evolving a \
@@ -77,7 +89,14 @@ class SimpleWalkers(BaseWalkers):
         self._model_states = StatesModel(state_dict=model_state_params, batch_size=n_walkers)
         self._env_states = StatesEnv(state_dict=env_state_params, batch_size=n_walkers)
         self._states = self.STATE_CLASS(batch_size=n_walkers, **kwargs)
+        self._uses_l2_distance = distance_function is None
         self.distance_function = distance_function if distance_function is not None else l2_norm
+        self._clone_probs_buf = None
+        self._zero_probs = None
+        self._obs_compas_buf = None
+        self._compas_dist_buf = None
+        self._will_clone_buf = None
+        self._arange = judo.arange(self.n)
         self.reward_scale = reward_scale
         self.distance_scale = distance_scale
         self._id_counter = 0
@@ -107,14 +126,10 @@ class SimpleWalkers(BaseWalkers):
 
     def get(self, name: str, default: Any = None) -> Any:
         """Access attributes of the :class:`Swarm` and its children."""
-        if hasattr(self.states, name):
-            return getattr(self.states, name)
-        elif hasattr(self.env_states, name):
-            return getattr(self.env_states, name)
-        elif hasattr(self.model_states, name):
-            return getattr(self.model_states, name)
-        elif hasattr(self, name):
-            return getattr(self, name)
+        for owner in (self.states, self.env_states, self.model_states, self):
+            value = getattr(owner, name, _MISSING)
+            if value is not _MISSING:
+                return value
         return default
 
     def ids(self) -> Tensor:
@@ -198,11 +213,48 @@ class SimpleWalkers(BaseWalkers):
         The internal :class:`StateWalkers` is updated with the relativized distance values.
         """
         # TODO(guillemdb): Check if self.get_in_bounds_compas() works better.
-        compas_ix = self.random_state.permutation(judo.arange(self.n))
+        if Backend.is_numpy():
+            # Shuffle a persistent index buffer in place instead of allocating
+            # a fresh permutation every iteration.
+            if self._compas_dist_buf is None:
+                self._compas_dist_buf = numpy.arange(self.n, dtype=numpy.int64)
+            compas_ix = self._compas_dist_buf
+            self.random_state.shuffle(compas_ix)
+        else:
+            compas_ix = self.random_state.permutation(self._arange)
         obs = self.env_states.observs.reshape(self.n, -1)
-        distances = self.distance_function(obs, obs[compas_ix])
-        distances = relativize(distances.flatten())
-        self.update_states(distances=distances, compas_dist=compas_ix)
+        if self._uses_l2_distance and Backend.is_numpy():
+            # Work on contiguous float32 rows: distances are stored as float32
+            # anyway and the narrower dtype halves the bandwidth of the
+            # reductions below.
+            obs = numpy.ascontiguousarray(obs, dtype=numpy.float32)
+            # Expand ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b to skip the (n, d)
+            # difference temporary of the default l2 distance.
+            if obs.shape[1] > _DIST_BLOCK_COLS:
+                # Tile very wide observations so each block stays cache
+                # resident and the full (n, d) companion gather is never built.
+                sq_norms = numpy.zeros(self.n, dtype=obs.dtype)
+                cross = numpy.zeros(self.n, dtype=obs.dtype)
+                for start in range(0, obs.shape[1], _DIST_BLOCK_COLS):
+                    block = obs[:, start : start + _DIST_BLOCK_COLS]
+                    sq_norms += numpy.einsum("ij,ij->i", block, block)
+                    cross += numpy.einsum("ij,ij->i", block, block[compas_ix])
+            else:
+                buf = self._obs_compas_buf
+                if buf is None or buf.shape != obs.shape or buf.dtype != obs.dtype:
+                    buf = self._obs_compas_buf = numpy.empty_like(obs)
+                obs_compas = numpy.take(obs, compas_ix, axis=0, out=buf)
+                sq_norms = numpy.einsum("ij,ij->i", obs, obs)
+                cross = numpy.einsum("ij,ij->i", obs, obs_compas)
+            sq_dists = numpy.maximum(sq_norms + sq_norms[compas_ix] - 2.0 * cross, 0.0)
+            distances = numpy.sqrt(sq_dists)
+        else:
+            distances = self.distance_function(obs, obs[compas_ix]).flatten()
+        if isinstance(distances, numpy.ndarray) and distances.dtype.kind == "f":
+            distances = relativize_kernel(distances)
+        else:
+            distances = relativize(distances)
+        self.states.update(distances=distances, compas_dist=compas_ix)
 
     def calculate_virtual_reward(self) -> None:
         """
@@ -211,11 +263,20 @@ class SimpleWalkers(BaseWalkers):
         The cumulative_reward is transformed with the relativize function. \
         The distances stored in the :class:`StatesWalkers` are already transformed.
         """
-        processed_rewards = relativize(self.states.cum_rewards)
-        virt_rw = (
-            processed_rewards ** self.reward_scale * self.states.distances ** self.distance_scale
-        )
-        self.update_states(virtual_rewards=virt_rw, processed_rewards=processed_rewards)
+        if Backend.is_numpy():
+            virt_rw, processed_rewards = virtual_reward_kernel(
+                self.states.cum_rewards,
+                self.states.distances,
+                self.reward_scale,
+                self.distance_scale,
+            )
+        else:
+            processed_rewards = relativize(self.states.cum_rewards)
+            virt_rw = (
+                processed_rewards ** self.reward_scale
+                * self.states.distances ** self.distance_scale
+            )
+        self.states.update(virtual_rewards=virt_rw, processed_rewards=processed_rewards)
 
     def get_in_bounds_compas(self) -> Tensor:
         """
@@ -226,12 +287,17 @@ class SimpleWalkers(BaseWalkers):
             random with replacement. Its length is equal to the number of walkers.
 
         """
-        if not self.states.in_bounds.any():  # No need to sample if all walkers are dead.
-            return judo.arange(self.n)
-        alive_indexes = judo.arange(self.n, dtype=int)[self.states.in_bounds]
-        compas_ix = self.random_state.permutation(alive_indexes)
-        compas = self.random_state.choice(compas_ix, self.n, replace=True)
-        compas[: len(compas_ix)] = compas_ix
+        in_bounds = self.states.in_bounds
+        alive_indexes = (
+            numpy.flatnonzero(in_bounds)
+            if isinstance(in_bounds, numpy.ndarray)
+            else self._arange[in_bounds]
+        )
+        n_alive = len(alive_indexes)
+        if n_alive == 0:  # No need to sample if all walkers are dead.
+            return self._arange
+        compas = alive_indexes[self.random_state.randint(0, n_alive, size=self.n)]
+        compas[:n_alive] = self.random_state.permutation(alive_indexes)
         return compas
 
     def update_clone_probs(self) -> None:
@@ -242,20 +308,30 @@ class SimpleWalkers(BaseWalkers):
         and the index of the randomly chosen companions that were selected to \
         compare the virtual rewards.
         """
+        virtual_rewards = self.states.virtual_rewards
         all_virtual_rewards_are_equal = (
-            self.states.virtual_rewards == self.states.virtual_rewards[0]
-        ).all()
+            bool(all_equal_kernel(virtual_rewards))
+            if isinstance(virtual_rewards, numpy.ndarray)
+            else bool(virtual_rewards.max() == virtual_rewards.min())
+        )
         if all_virtual_rewards_are_equal:
-            clone_probs = judo.zeros(self.n, dtype=dtype.float)
-            compas_ix = judo.arange(self.n)
+            if self._zero_probs is None:
+                self._zero_probs = judo.zeros(self.n, dtype=dtype.float)
+            clone_probs = self._zero_probs
+            compas_ix = self._arange
         else:
             compas_ix = self.get_in_bounds_compas()
-            companions = self.states.virtual_rewards[compas_ix]
+            vr = self.states.virtual_rewards
             # This value can be negative!!
-            clone_probs = (companions - self.states.virtual_rewards) / self.states.virtual_rewards
-        self.update_states(clone_probs=clone_probs, compas_clone=compas_ix)
+            if Backend.is_numpy():
+                if self._clone_probs_buf is None or self._clone_probs_buf.shape != vr.shape:
+                    self._clone_probs_buf = numpy.empty_like(vr)
+                clone_probs = clone_probs_kernel(vr, compas_ix, self._clone_probs_buf)
+            else:
+                clone_probs = (vr[compas_ix] - vr) / vr
+        self.states.update(clone_probs=clone_probs, compas_clone=compas_ix)
 
-    def balance(self) -> Tuple[set, set]:
+    def balance(self) -> Tuple[Tensor, Tensor]:
         """
         Perform an iteration of the FractalAI algorithm for balancing the \
         walkers distribution.
@@ -264,19 +340,19 @@ class SimpleWalkers(BaseWalkers):
         and performs the cloning process.
 
         Returns:
-            A tuple containing two sets: The first one represent the unique ids \
+            A tuple containing two arrays: The first one contains the unique ids \
             of the states for each walker at the start of the iteration. The second \
-            one contains the ids of the states after the cloning process.
+            one contains the unique ids of the states after the cloning process.
 
         """
-        # old_ids = set(numpy.unique(judo.to_numpy(self.states.id_walkers)))
+        old_ids = numpy.unique(judo.to_numpy(self.states.id_walkers))
         self.states.in_bounds = judo.logical_not(self.env_states.oobs)
         self.calculate_distances()
         self.calculate_virtual_reward()
         self.update_clone_probs()
         self.clone_walkers()
-        # new_ids = set(numpy.unique(judo.to_numpy(self.states.id_walkers)))
-        return None, None  # old_ids, new_ids
+        new_ids = numpy.unique(judo.to_numpy(self.states.id_walkers))
+        return old_ids, new_ids
 
     def clone_walkers(self) -> None:
         """
@@ -285,15 +361,34 @@ class SimpleWalkers(BaseWalkers):
         This function will update the internal :class:`StatesWalkers`, \
         :class:`StatesEnv`, and :class:`StatesModel`.
         """
-        will_clone = self.states.clone_probs > self.random_state.random_sample(self.n)
-        will_clone[self.env_states.oobs] = True  # Out of bounds walkers always clone
-        self.update_states(will_clone=will_clone)
+        if Backend.is_numpy():
+            if self._will_clone_buf is None:
+                self._will_clone_buf = numpy.empty(self.n, dtype=numpy.bool_)
+            will_clone = numpy.greater(
+                self.states.clone_probs,
+                self.random_state.random_sample(self.n),
+                out=self._will_clone_buf,
+            )
+            # Out of bounds walkers always clone
+            numpy.logical_or(will_clone, self.env_states.oobs, out=will_clone)
+        else:
+            will_clone = self.states.clone_probs > self.random_state.random_sample(self.n)
+            # Out of bounds walkers always clone
+            will_clone[self.env_states.oobs] = True
+        self.states.update(will_clone=will_clone)
         clone, compas = self.states.clone()
+        compas_clone = compas[clone]
         self._env_states.clone(
-            will_clone=clone, compas_ix=compas, ignore=self.ignore_clone.get("env")
+            will_clone=clone,
+            compas_ix=compas,
+            compas_clone=compas_clone,
+            ignore=self.ignore_clone.get("env"),
         )
         self._model_states.clone(
-            will_clone=clone, compas_ix=compas, ignore=self.ignore_clone.get("model")
+            will_clone=clone,
+            compas_ix=compas,
+            compas_clone=compas_clone,
+            ignore=self.ignore_clone.get("model"),
         )
 
     def reset(
@@ -356,14 +451,19 @@ class SimpleWalkers(BaseWalkers):
             rewards: Array containing the last rewards received by every walker.
         """
         if self._accumulate_rewards:
-            if self.states.get("cum_rewards") is None:
-                cum_rewards = judo.zeros(rewards.shape[0])
+            cum_rewards = self.states.get("cum_rewards")
+            if cum_rewards is None:
+                cum_rewards = judo.copy(rewards)
+            elif isinstance(cum_rewards, numpy.ndarray) and cum_rewards.shape == rewards.shape:
+                # The states already reference this buffer, so the in-place add
+                # does not need to be written back.
+                numpy.add(cum_rewards, rewards, out=cum_rewards)
+                return
             else:
-                cum_rewards = self.states.cum_rewards
-            cum_rewards = cum_rewards + rewards
+                cum_rewards = cum_rewards + rewards
         else:
             cum_rewards = rewards
-        self.update_states(cum_rewards=cum_rewards)
+        self.states.update(cum_rewards=cum_rewards)
 
     @staticmethod
     def _repr_state(state):
@@ -511,16 +611,24 @@ class Walkers(SimpleWalkers):
     def calculate_virtual_reward(self):
         """Apply the virtual reward formula to account for all the different goal scores."""
         rewards = -1 * self.states.cum_rewards if self.minimize else self.states.cum_rewards
-        processed_rewards = relativize(rewards)
-        score_reward = processed_rewards ** self.reward_scale
-        score_dist = self.states.distances ** self.distance_scale
-        virt_rw = score_reward * score_dist
-        dist_prob = score_dist / score_dist.sum()
-        reward_prob = score_reward / score_reward.sum()
-        total_entropy = judo.prod(2 - dist_prob ** reward_prob)
-        self._min_entropy = judo.prod(2 - reward_prob ** reward_prob)
+        if Backend.is_numpy():
+            virt_rw, processed_rewards, total_entropy, min_entropy = (
+                virtual_reward_entropy_kernel(
+                    rewards, self.states.distances, self.reward_scale, self.distance_scale,
+                )
+            )
+            self._min_entropy = min_entropy
+        else:
+            processed_rewards = relativize(rewards)
+            score_reward = processed_rewards ** self.reward_scale
+            score_dist = self.states.distances ** self.distance_scale
+            virt_rw = score_reward * score_dist
+            dist_prob = score_dist / score_dist.sum()
+            reward_prob = score_reward / score_reward.sum()
+            total_entropy = judo.prod(2 - dist_prob ** reward_prob)
+            self._min_entropy = judo.prod(2 - reward_prob ** reward_prob)
         self.efficiency = self._min_entropy / total_entropy
-        self.update_states(virtual_rewards=virt_rw, processed_rewards=processed_rewards)
+        self.states.update(virtual_rewards=virt_rw, processed_rewards=processed_rewards)
         if self.critic is not None:
             critic_states = self.critic.calculate(
                 walkers_states=self.states,
@@ -553,20 +661,25 @@ class Walkers(SimpleWalkers):
         If no walker is alive it will return the index of the last walker, which \
         corresponds with the best state found.
         """
-        rewards = self.states.cum_rewards[self.states.in_bounds]
+        in_bounds = self.states.in_bounds
+        cum_rewards = self.states.cum_rewards
+        if Backend.is_numpy():
+            if not in_bounds.any():
+                return self.n - 1
+            fill_value = numpy.inf if self.minimize else numpy.NINF
+            scores = numpy.where(in_bounds, cum_rewards, fill_value)
+            return int(scores.argmin() if self.minimize else scores.argmax())
+        rewards = cum_rewards[in_bounds]
         if len(rewards) == 0:
             return self.n - 1
         best = rewards.min() if self.minimize else rewards.max()
-        idx = judo.astype(self.states.cum_rewards == best, dtype.int)
-        ix = idx.argmax()
-        return int(ix)
+        idx = judo.astype(cum_rewards == best, dtype.int)
+        return int(idx.argmax())
 
     def update_best(self):
         """Keep track of the best state found and its reward."""
         ix = self.get_best_index()
-        best_obs = self.env_states.observs[ix]
         best_reward = self.states.cum_rewards[ix]
-        best_state = self.env_states.states[ix]
         best_is_in_bounds = not bool(self.env_states.oobs[ix])
         has_improved = (
             self.states.best_reward > best_reward
@@ -574,10 +687,11 @@ class Walkers(SimpleWalkers):
             else self.states.best_reward < best_reward
         )
         if has_improved and best_is_in_bounds:
+            # Fetch the state and observation only when the best will be updated.
             self.states.update(
                 best_reward=best_reward,
-                best_state=best_state,
-                best_obs=best_obs,
+                best_state=self.env_states.states[ix],
+                best_obs=self.env_states.observs[ix],
                 best_id=self.states.id_walkers[ix],
                 best_time=self.env_states.times[ix],
             )
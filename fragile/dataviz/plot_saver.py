@@ -1,4 +1,7 @@
+import io
 import os
+import queue
+import threading
 
 import holoviews
 
@@ -42,6 +45,11 @@ class PlotSaver(SwarmWrapper):
         self.output_path = output_path
         self._save_kwargs = kwargs
         self._fmt = fmt
+        self._last_saved_epoch = -1
+        self._save_error = None
+        self._save_queue = queue.Queue(maxsize=4)
+        self._save_worker = threading.Thread(target=self._save_loop, daemon=True)
+        self._save_worker.start()
         self.plot()
 
     def run_step(self):
@@ -52,7 +60,10 @@ class PlotSaver(SwarmWrapper):
         self.unwrapped.run_step()
         if self.unwrapped.epoch % self.stream_interval == 0:
             self.stream_plots()
-            self.save_plot()
+            # Skip the render when this epoch was already exported.
+            if self.unwrapped.epoch != self._last_saved_epoch:
+                self.save_plot()
+                self._last_saved_epoch = self.unwrapped.epoch
 
     def _get_file_name(self) -> str:
         swarmviz_name = self.unwrapped.__class__.__name__.lower()
@@ -60,16 +71,53 @@ class PlotSaver(SwarmWrapper):
         return filename
 
     def save_plot(self):
-        """Save the plot of the wrapped :class:`Swarm` to the target path."""
+        """Render the plot of the wrapped :class:`Swarm` and queue the result \
+        so the background worker writes it to the target path."""
+        self._raise_pending_save_error()
+        if not self._save_worker.is_alive():
+            raise RuntimeError("The PlotSaver worker thread is not running.")
         filename = self._get_file_name()
-        filepath = os.path.join(self.output_path, filename)
+        # Render on the main thread: the plotting backends are not thread
+        # safe, so only the disk write overlaps with the run loop.
+        data = io.BytesIO()
         holoviews.save(
             self.current_plot,
-            filename=filepath,
+            filename=data,
             fmt=self._fmt,
             **self._save_kwargs,
             backend=holoviews.Store.current_backend
         )
+        self._save_queue.put((data.getvalue(), filename))
+
+    def _raise_pending_save_error(self):
+        """Re-raise the first error hit by the background worker, if any."""
+        if self._save_error is not None:
+            error, self._save_error = self._save_error, None
+            raise error
+
+    def _save_loop(self):
+        """Write queued plots to disk, overlapping the I/O with the run loop.
+
+        Errors are stored instead of raised so the worker keeps draining the \
+        queue; they surface on the next ``save_plot`` call or when ``run`` ends.
+        """
+        while True:
+            data, filename = self._save_queue.get()
+            try:
+                self._write_plot(data, filename)
+            except Exception as exception:
+                if self._save_error is None:
+                    self._save_error = exception
+            finally:
+                self._save_queue.task_done()
+
+    def _write_plot(self, data: bytes, filename: str):
+        """Write the rendered plot to a temporary file and atomically move it in place."""
+        filepath = os.path.join(self.output_path, filename)
+        tmp_path = os.path.join(self.output_path, "_tmp_" + filename)
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, filepath)
 
     def run(
         self,
@@ -97,3 +145,6 @@ class PlotSaver(SwarmWrapper):
 
         """
         self.unwrapped.__class__.run(self)
+        # Make sure every queued plot reaches disk before returning.
+        self._save_queue.join()
+        self._raise_pending_save_error()
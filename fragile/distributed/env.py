@@ -4,11 +4,14 @@ try:
     from torch import multiprocessing
 except ImportError:
     import multiprocessing
-import sys  # noqa: I202
+import os  # noqa: I202
+import pickle
+import sys
 import traceback
 from typing import Callable, Dict, List, Tuple, Union
 
 import judo
+import numpy
 
 from fragile.core.env import Environment as CoreEnv
 from fragile.core.states import StatesEnv, StatesModel
@@ -17,6 +20,52 @@ from fragile.core.wrappers import BaseWrapper, EnvWrapper
 from fragile.distributed.ray import ray
 
 
+def _pipe_send(conn, obj):
+    """
+    Send ``obj`` through ``conn`` with pickle protocol 5.
+
+    The payload buffers of large arrays travel out-of-band, skipping the \
+    intermediate copy into the pickle stream that the default protocol makes.
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    conn.send_bytes(len(buffers).to_bytes(4, "little"))
+    conn.send_bytes(data)
+    for buffer in buffers:
+        conn.send_bytes(buffer)
+
+
+def _pipe_recv(conn):
+    """Receive and rebuild an object sent by :func:`_pipe_send`."""
+    n_buffers = int.from_bytes(conn.recv_bytes(), "little")
+    data = conn.recv_bytes()
+    # Copy every payload into a bytearray: recv_bytes returns immutable bytes,
+    # which would rebuild the arrays as read-only.
+    buffers = [bytearray(conn.recv_bytes()) for _ in range(n_buffers)]
+    return pickle.loads(data, buffers=buffers)
+
+
+def _autodetect_workers(maximum: int = 32) -> int:
+    """
+    Infer a worker count from the CPUs actually allocated to this process.
+
+    The SLURM allocation and the scheduler affinity mask are honored before \
+    falling back to the total CPU count, so constrained cluster nodes are \
+    not oversubscribed.
+    """
+    slurm_cpus = os.environ.get("SLURM_CPUS_PER_TASK")
+    if slurm_cpus is not None:
+        try:
+            return max(1, min(int(slurm_cpus), maximum))
+        except ValueError:
+            pass
+    try:
+        n_cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # sched_getaffinity is only available on Linux.
+        n_cpus = os.cpu_count() or 1
+    return max(1, min(n_cpus, maximum))
+
+
 class _ExternalProcess:
     """
     Step environment in a separate process for lock free paralellism.
@@ -46,6 +95,9 @@ class _ExternalProcess:
     _EXCEPTION = 4
     _CLOSE = 5
     TARGET = "make_transitions"
+    # Environment metadata that stays constant for the lifetime of the worker,
+    # so it only needs to cross the pipe once.
+    _CACHED_ATTRS = frozenset({"states_shape", "observs_shape", "n_actions"})
 
     def __init__(self, constructor):
 
@@ -55,13 +107,15 @@ class _ExternalProcess:
         self._process.start()
         self._states_shape = None
         self._observs_shape = None
+        self._attr_cache = {}
 
     def __getattr__(self, name):
         """
         Request an attribute from the environment.
 
         Note that this involves communication with the external process, so it can
-        be slow.
+        be slow. Attributes known to be constant are cached after the first
+        round trip.
 
         Args:
           name: Attribute to access.
@@ -70,8 +124,14 @@ class _ExternalProcess:
           Value of the attribute.
 
         """
-        self._conn.send((self._ACCESS, name))
-        return self._receive()
+        cache = self.__dict__.get("_attr_cache")
+        if cache is not None and name in cache:
+            return cache[name]
+        _pipe_send(self._conn, (self._ACCESS, name))
+        value = self._receive()
+        if cache is not None and name in self._CACHED_ATTRS:
+            cache[name] = value
+        return value
 
     def call(self, name, *args, **kwargs):
         """
@@ -87,13 +147,13 @@ class _ExternalProcess:
 
         """
         payload = name, args, kwargs
-        self._conn.send((self._CALL, payload))
+        _pipe_send(self._conn, (self._CALL, payload))
         return self._receive
 
     def close(self):
         """Send a close message to the external process and join it."""
         try:
-            self._conn.send((self._CLOSE, None))
+            _pipe_send(self._conn, (self._CLOSE, None))
             self._conn.close()
         except IOError:
             # The connection was already closed.
@@ -157,10 +217,14 @@ class _ExternalProcess:
           Payload object of the message.
 
         """
-        message, payload = self._conn.recv()
+        message, payload = _pipe_recv(self._conn)
         # Re-raise exceptions in the main process.
         if message == self._EXCEPTION:
-            stacktrace = payload
+            exception, stacktrace = payload
+            if exception is not None:
+                # Keep the original exception type; the worker traceback
+                # travels as the cause since tracebacks do not pickle.
+                raise exception from Exception(stacktrace)
             raise Exception(stacktrace)
         if message == self._RESULT:
             return payload
@@ -182,29 +246,33 @@ class _ExternalProcess:
             env = constructor()
             while True:
                 try:
-                    # Only block for short times to have keyboard exceptions be raised.
-                    if not conn.poll(0.1):
-                        continue
-                    message, payload = conn.recv()
+                    # Block until a message arrives. Shutdown is driven by the
+                    # _CLOSE message or the pipe closing, and an interrupt
+                    # aborts the blocking recv, so there is no need to wake up
+                    # periodically to poll for input.
+                    message, payload = _pipe_recv(conn)
                 except (EOFError, KeyboardInterrupt):
                     break
                 if message == self._ACCESS:
                     name = payload
                     result = getattr(env, name)
-                    conn.send((self._RESULT, result))
+                    _pipe_send(conn, (self._RESULT, result))
                     continue
                 if message == self._CALL:
                     name, args, kwargs = payload
                     result = getattr(env, name)(*args, **kwargs)
-                    conn.send((self._RESULT, result))
+                    _pipe_send(conn, (self._RESULT, result))
                     continue
                 if message == self._CLOSE:
                     assert payload is None
                     break
                 raise KeyError("Received message of unknown type {}".format(message))
-        except Exception:  # pylint: disable=broad-except
+        except Exception as exception:  # pylint: disable=broad-except
             stacktrace = "".join(traceback.format_exception(*sys.exc_info()))
-            conn.send((self._EXCEPTION, stacktrace))
+            try:
+                _pipe_send(conn, (self._EXCEPTION, (exception, stacktrace)))
+            except Exception:  # The exception itself may not be picklable.
+                _pipe_send(conn, (self._EXCEPTION, (None, stacktrace)))
             conn.close()
 
 
@@ -234,6 +302,7 @@ class _BatchEnv:
         self._n_chunks = len(self._envs)
         self._blocking = blocking
         self.kwargs_mode = None
+        self._chunk_slices_cache = {}
 
     def __len__(self):
         """Return mumber of combined environments."""
@@ -283,16 +352,43 @@ class _BatchEnv:
         kwargs = {}
         for k in data_dicts[0].keys():
             try:
-                grouped = judo.concatenate([judo.to_backend(ddict[k]) for ddict in data_dicts])
+                values = [ddict[k] for ddict in data_dicts]
+                if all(isinstance(value, numpy.ndarray) for value in values):
+                    # Concatenate on the host and convert once, so GPU backends
+                    # pay a single transfer per key instead of one per chunk.
+                    grouped = judo.to_backend(numpy.concatenate(values))
+                else:
+                    grouped = judo.concatenate([judo.to_backend(value) for value in values])
             except Exception:
                 val = str([ddict[k].shape for ddict in data_dicts])
                 raise ValueError(val)
             kwargs[k] = grouped
         return kwargs
 
+    def _chunk_slices(self, batch_size: int) -> List[slice]:
+        """Return the per-worker slices for ``batch_size``, cached across steps."""
+        slices = self._chunk_slices_cache.get(batch_size)
+        if slices is None:
+            n_chunks = min(self._n_chunks, batch_size)
+            base, extra = divmod(batch_size, n_chunks)
+            slices, start = [], 0
+            for i in range(n_chunks):
+                end = start + base + (1 if i < extra else 0)
+                slices.append(slice(start, end))
+                start = end
+            self._chunk_slices_cache[batch_size] = slices
+        return slices
+
     def _split_inputs_in_chunks(self, *args, **kwargs):
         self.kwargs_mode = len(args) == 0
         if self.kwargs_mode:
+            values = list(kwargs.values())
+            if values and all(judo.is_tensor(value) for value in values):
+                lengths = {len(value) for value in values}
+                if len(lengths) == 1:
+                    # Fixed-shape steps reuse the precomputed chunk boundaries.
+                    slices = self._chunk_slices(lengths.pop())
+                    return [{k: v[sl] for k, v in kwargs.items()} for sl in slices]
             return judo.split_kwargs_in_chunks(kwargs, self._n_chunks)
         else:
             return judo.split_args_in_chunks(args, self._n_chunks)
@@ -316,6 +412,8 @@ class _BatchEnv:
         split_results = [result if self._blocking else result() for result in results]
         if isinstance(split_results[0], dict):
             merged = self._merge_data(split_results)
+        elif all(isinstance(res, numpy.ndarray) for res in split_results):
+            merged = judo.to_backend(numpy.concatenate(split_results))
         else:  # Assumes batch of tensors
             split_results = [judo.to_backend(res) for res in split_results]
             merged = judo.concatenate(split_results)
@@ -372,9 +470,10 @@ class ParallelEnv(EnvWrapper):
     def __init__(
         self,
         env_callable: Callable[..., CoreEnv],
-        n_workers: int = 8,
+        n_workers: int = None,
         blocking: bool = False,
         distribute: List[str] = None,
+        min_batch_for_parallel: int = None,
     ):
         """
         Initialize a :class:`ParallelEnv`.
@@ -382,17 +481,23 @@ class ParallelEnv(EnvWrapper):
         Args:
             env_callable: Returns the :class:`Environment` that will be distributed.
             n_workers: Number of processes that will step the \
-                       :class:`Environment` in parallel.
+                       :class:`Environment` in parallel. Defaults to the \
+                       number of CPUs allocated to the current process.
             blocking: If ``True`` perform the steps in a sequential fashion and \
                       block the process between steps.
             distribute: List of function names that will be executed in all the different workers.
+            min_batch_for_parallel: Batches smaller than this value will be \
+                                    stepped in the local environment, skipping \
+                                    the inter-process communication overhead. \
+                                    If ``None`` every batch is distributed.
 
         """
-        self.n_workers = n_workers
+        self.n_workers = n_workers if n_workers is not None else _autodetect_workers()
         self.blocking = blocking
+        self.min_batch_for_parallel = min_batch_for_parallel
         self._distribute_names = distribute if distribute is not None else []
         self.parallel_env = _ParallelEnvironment(
-            env_callable=env_callable, n_workers=n_workers, blocking=blocking
+            env_callable=env_callable, n_workers=self.n_workers, blocking=blocking
         )
         super(ParallelEnv, self).__init__(env_callable(), name="_local_env")
 
@@ -431,6 +536,13 @@ class ParallelEnv(EnvWrapper):
             States containing the information that describes the new state of the Environment.
 
         """
+        small_batch = (
+            self.min_batch_for_parallel is not None
+            and len(env_states) < self.min_batch_for_parallel
+        )
+        if self.n_workers == 1 or small_batch:
+            # A single worker or a tiny batch pays more in IPC than it saves.
+            return self._local_env.step(model_states=model_states, env_states=env_states)
         transition_data = self.states_to_data(model_states=model_states, env_states=env_states)
         if not isinstance(transition_data, (dict, tuple)):
             raise ValueError(
@@ -487,7 +599,7 @@ class RayEnv(EnvWrapper):
     def __init__(
         self,
         env_callable: Callable[[dict], CoreEnv],
-        n_workers: int,
+        n_workers: int = None,
         env_kwargs: dict = None,
         options: dict = None,
         distribute: List[str] = None,
@@ -498,7 +610,8 @@ class RayEnv(EnvWrapper):
         Args:
             env_callable: Returns the :class:`Environment` that will be distributed.
             n_workers: Number of processes that will step the \
-                       :class:`Environment` in parallel.
+                       :class:`Environment` in parallel. Defaults to the \
+                       number of CPUs allocated to the current process.
             env_kwargs: Passed to ``env_callable``.
             options: passed to RemoteEnvironment.options().
             distribute: List of function names that will be executed in all the different workers.
@@ -508,13 +621,13 @@ class RayEnv(EnvWrapper):
 
         options = options if options is not None else {}
         env_kwargs = {} if env_kwargs is None else env_kwargs
-        self.n_workers = n_workers
+        self.n_workers = n_workers if n_workers is not None else _autodetect_workers()
         self._distribute_name = distribute if distribute is not None else {}
         self.envs: List[RemoteEnvironment] = [
             RemoteEnvironment.options(**options).remote(
                 env_callable=env_callable, env_kwargs=env_kwargs
             )
-            for _ in range(n_workers)
+            for _ in range(self.n_workers)
         ]
         super(RayEnv, self).__init__(env_callable(), name="_local_env")
 
@@ -601,13 +714,24 @@ class RayEnv(EnvWrapper):
     def _make_transitions(self, chunk_data):
         from fragile.distributed.ray import ray
 
+        # Put the chunk tensors in the object store explicitly so the actors
+        # map them zero-copy from plasma instead of pickling them inline.
         results = [
-            env.make_transitions.remote(**chunk)
+            env.make_transitions.remote(**{k: ray.put(v) for k, v in chunk.items()})
             if self.kwargs_mode
-            else env.make_transitions.remote(*chunk)
+            else env.make_transitions.remote(*[ray.put(v) for v in chunk])
             for env, chunk in zip(self.envs, chunk_data)
         ]
-        data_dicts = ray.get(results)
+        # Collect each chunk as soon as its worker finishes, so deserializing
+        # the early results overlaps with the slowest worker instead of
+        # starting after every reference resolves.
+        order = {ref: i for i, ref in enumerate(results)}
+        data_dicts = [None] * len(results)
+        pending = list(results)
+        while pending:
+            done, pending = ray.wait(pending, num_returns=1)
+            for ref in done:
+                data_dicts[order[ref]] = ray.get(ref)
         return data_dicts
 
     def distribute(self, name, **kwargs):
@@ -621,6 +745,8 @@ class RayEnv(EnvWrapper):
         split_results = ray.get(results)
         if isinstance(split_results[0], dict):
             merged = self._merge_data(split_results)
+        elif all(isinstance(res, numpy.ndarray) for res in split_results):
+            merged = judo.to_backend(numpy.concatenate(split_results))
         else:  # Assumes batch of tensors
             split_results = [judo.to_backend(res) for res in split_results]
             merged = judo.concatenate(split_results)
@@ -221,16 +221,12 @@ class Function(Environment):
             :class:`Function` domain, stacked across the first dimension.
 
         """
-        new_points = judo.zeros(tuple([batch_size]) + self.shape, dtype=judo.float32)
-        for i in range(batch_size):
-            values = self.random_state.uniform(
-                low=judo.astype(self.bounds.low, judo.float),
-                high=judo.astype(self.bounds.high, judo.float32),
-            )
-            values = judo.astype(values, self.bounds.low.dtype)
-            new_points[i, :] = values
-
-        return new_points
+        new_points = self.random_state.uniform(
+            low=judo.to_numpy(self.bounds.low),
+            high=judo.to_numpy(self.bounds.high),
+            size=tuple([batch_size]) + self.shape,
+        )
+        return judo.astype(tensor(new_points), judo.float32)
 
 
 class Minimizer:
@@ -176,6 +176,13 @@ class TestDiscreteUniform:
         assert "critic_score" in model_states.keys()
         assert (model_states.critic_score == 1).all()
 
+    def test_actions_dtype(self):
+        model = DiscreteUniform(n_actions=10, actions_dtype=dtype.int32)
+        params = model.get_params_dict()
+        assert params["actions"]["dtype"] == dtype.int32
+        model_states = model.predict(batch_size=10)
+        assert model_states.actions.dtype == dtype.int32
+
     @pytest.mark.parametrize("n_actions", [2, 5, 10, 20])
     def test_sample_with_critic(self, n_actions):
         model = DiscreteUniform(n_actions=n_actions, critic=DummyCritic())
@@ -211,6 +218,22 @@ class TestBinarySwap:
         assert (vectors > 0).all(), actions
         assert (vectors <= 3).all(), actions
 
+    def test_create_new_states_keeps_sizes(self):
+        model = BinarySwap(n_actions=8, n_swaps=2)
+        first = model.create_new_states(batch_size=5)
+        second = model.create_new_states(batch_size=5)
+        assert first.actions.shape == (5, 8)
+        assert second.actions.shape == (5, 8)
+
+    def test_distinct_swaps(self):
+        model = BinarySwap(n_actions=10, n_swaps=3, distinct_swaps=True)
+        actions = model.predict(batch_size=10).actions
+        assert (actions.sum(axis=1) == 3).all(), actions
+
+    def test_distinct_swaps_invalid_n_swaps(self):
+        with pytest.raises(ValueError):
+            BinarySwap(n_actions=4, n_swaps=5, distinct_swaps=True)
+
 
 class TestContinuousModel:
     def test_attributes(self):